@@ -0,0 +1,117 @@
+import datetime
+import numpy as np
+import pandas as pd
+from config import load_config
+
+DEFAULT_CALENDAR = "default"
+DEFAULT_WEEKMASK = "Mon Tue Wed Thu Fri"
+
+# Calendars live in config.json under "calendars", keyed by team name:
+#   {"default": {"weekmask": "Mon Tue Wed Thu Fri", "holidays": ["2025-12-25"]},
+#    "Team B": {"weekmask": "Sun Mon Tue Wed Thu", "holidays": []}}
+# Teams without an entry use the default calendar.
+def load_calendars():
+    specs = load_config().get("calendars") or {}
+    default_spec = specs.get(DEFAULT_CALENDAR, {})
+    calendars = {DEFAULT_CALENDAR: build_calendar(default_spec)}
+    for team, spec in specs.items():
+        if team != DEFAULT_CALENDAR:
+            calendars[team] = build_calendar({**default_spec, **spec})
+    return calendars
+
+def build_calendar(spec):
+    return np.busdaycalendar(
+        weekmask=spec.get("weekmask", DEFAULT_WEEKMASK),
+        holidays=spec.get("holidays", [])
+    )
+
+# Timestamps such as Resolved carry the offset of whoever's profile served them and
+# change across DST, so they are normalized to one zone before being cut to days.
+# Set "timezone" in config.json (e.g. "Europe/Berlin"); the machine's zone is the default.
+def load_timezone():
+    return load_config().get("timezone") or datetime.datetime.now().astimezone().tzinfo
+
+def to_days(series, timezone=None):
+    series = pd.Series(series)
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        local = series.dt.tz_convert(timezone or load_timezone()).dt.tz_localize(None)
+    elif pd.api.types.is_datetime64_dtype(series):
+        local = series
+    else:
+        # Date-only fields are already local days; only parse timestamps as UTC
+        text = series.astype("string")
+        timestamps = text.str.contains("T", na=False)
+        local = pd.to_datetime(text.where(~timestamps), errors="coerce")
+        if timestamps.any():
+            parsed = pd.to_datetime(text[timestamps], utc=True, errors="coerce")
+            local[timestamps] = parsed.dt.tz_convert(timezone or load_timezone()).dt.tz_localize(None)
+    return local.to_numpy().astype("datetime64[D]")
+
+def working_days(start, end, calendar):
+    # Inclusive working-day count between two datetime64[D] arrays; NaN where a date is missing
+    valid = ~(np.isnat(start) | np.isnat(end))
+    result = np.full(len(start), np.nan)
+    result[valid] = np.busday_count(start[valid], end[valid] + 1, busdaycal=calendar)
+    return result
+
+def add_working_day_columns(df, calendars=None, today=None, timezone=None):
+    calendars = calendars or load_calendars()
+    timezone = timezone or load_timezone()
+    today = np.datetime64(today or pd.Timestamp.now().normalize(), "D")
+
+    df = df.copy()
+    start = to_days(df["StartDate"], timezone)
+    target = to_days(df["TargetEnd"], timezone)
+    resolved = to_days(df["Resolved"], timezone) if "Resolved" in df else np.full(len(df), np.datetime64("NaT"), dtype="datetime64[D]")
+    teams = df["Team"].to_numpy() if "Team" in df else np.full(len(df), None)
+
+    working_end = target.copy()
+    duration = np.full(len(df), np.nan)
+    slip = np.full(len(df), np.nan)
+    remaining = np.full(len(df), np.nan)
+
+    # One vectorized pass per calendar rather than per row
+    team_calendars = pd.Series(teams).map(lambda t: t if t in calendars else DEFAULT_CALENDAR).to_numpy()
+    for name in np.unique(team_calendars):
+        calendar = calendars[name]
+        rows = team_calendars == name
+        has_target = rows & ~np.isnat(target)
+
+        # Last working day on or before the target end
+        working_end[has_target] = np.busday_offset(target[has_target], 0, roll="backward", busdaycal=calendar)
+        duration[rows] = working_days(start[rows], working_end[rows], calendar)
+
+        # Slip: working days from target end to resolution (or today while open)
+        is_open = np.isnat(resolved)
+        finish = np.where(is_open, today, resolved)
+        late = has_target & ~np.isnat(finish)
+        slip[late] = np.busday_count(working_end[late], finish[late], busdaycal=calendar)
+        slip[late & is_open] = np.maximum(slip[late & is_open], 0)
+
+        pending = has_target & is_open
+        remaining[pending] = np.maximum(np.busday_count(today, working_end[pending] + 1, busdaycal=calendar), 0)
+
+    # Bars end after the last working day, but never before they start
+    working_end = np.where(~np.isnat(start) & (working_end < start), target, working_end)
+
+    df["WorkingEnd"] = pd.to_datetime(working_end)
+    df["AdjustedEnd"] = df["WorkingEnd"] + pd.Timedelta(days=1)
+    df["WorkingDays"] = duration
+    df["SlipDays"] = slip
+    df["RemainingWorkingDays"] = remaining
+    return df
+
+def working_day_ticks(start, end, calendar=None):
+    calendar = calendar if calendar is not None else load_calendars()[DEFAULT_CALENDAR]
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    return days[np.is_busday(days, busdaycal=calendar)]
+
+def working_day_offsets(dates, calendar=None, timezone=None):
+    # Working days from the earliest date; used to place issues on a schedule
+    calendar = calendar if calendar is not None else load_calendars()[DEFAULT_CALENDAR]
+    days = to_days(dates, timezone)
+    result = np.full(len(days), np.nan)
+    valid = ~np.isnat(days)
+    if valid.any():
+        result[valid] = np.busday_count(days[valid].min(), days[valid], busdaycal=calendar)
+    return result
@@ -0,0 +1,205 @@
+import importlib
+import numpy as np
+import pandas as pd
+from jira_client import api_request, api_request_sites, resolve_sites
+from jira_parser import parse_issues_to_dataframe, parse_site_results_to_dataframe
+from calendars import add_working_day_columns, working_day_offsets
+from dependencies import critical_path, dependency_edges, node_keys
+from hierarchy import HIERARCHY_LEVELS, fetch_issues_by_keys, load_ancestors, load_descendants, rollup
+
+# Renderer backends are imported lazily so optional plotting libraries are only
+# needed when that backend is requested: name -> (module, function)
+RENDERERS = {
+    "bokeh": ("charts_bokeh", "render_gantt_bokeh"),
+    "plotly": ("charts", "render_gantt_plotly"),
+    "image": ("charts", "render_gantt_image")
+}
+
+# Adaptive label placement
+CHAR_PIXELS = 30         # Conservative estimate, tune for your font
+PX_PER_DAY = 100         # Chart's x-scaling; increase if bars appear too short
+MS_PER_DAY = 86400000
+MS_PER_PX = MS_PER_DAY / PX_PER_DAY
+LABEL_PADDING = 50       # Extra space to prevent near-overflow
+
+LAYOUT_COLUMNS = [
+    'Key', 'Summary', 'Assignee', 'Team', 'Lane', 'StartDate', 'TargetEnd',
+    'AdjustedEnd', 'WorkingDays', 'SlipDays', 'RemainingWorkingDays',
+    'width', 'center', 'label_above'
+]
+
+def get_renderer(name):
+    module, function = RENDERERS[name]
+    return getattr(importlib.import_module(module), function)
+
+def load_sprint_issues(sprint_name, level=None, sites=None):
+    print(f"Querying issues for sprint: {sprint_name}")
+
+    jql = f'Sprint = "{sprint_name}"'
+    if sites:
+        sites = resolve_sites(sites)
+        results, _ = api_request_sites(endpoint="search", sites=sites, params={"jql": jql}, paginate=True)
+        df = parse_site_results_to_dataframe(results)
+    else:
+        result = api_request(endpoint="search", params={"jql": jql}, paginate=True)
+        df = parse_issues_to_dataframe(result)
+
+    if df.empty:
+        print("No issues found for this sprint.")
+        return None, None
+
+    title = f"Gantt Chart for Sprint: {sprint_name}"
+    if level:
+        print(f"Rolling up issues to {level} level")
+        if sites:
+            # Parent keys are only unique within a site, so roll up each site separately
+            cloud_ids = {site["name"] or site["id"]: site["id"] for site in sites}
+            df = pd.concat([
+                rollup(load_ancestors(group, cloud_id=cloud_ids[site]), level).assign(Site=site)
+                for site, group in df.groupby("Site")
+            ], ignore_index=True)
+        else:
+            df = rollup(load_ancestors(df), level)
+        title = f"{title} ({level} roll-up)"
+        if df.empty:
+            print(f"No issues roll up to the {level} level.")
+            return None, None
+
+    if sites and len(sites) > 1:
+        df["Team"] = df["Site"] + " / " + df["Team"].fillna("Unassigned")
+
+    return df, title
+
+def load_issue_children(issue_key, level=None, site=None):
+    print(f"Drilling down into issue: {issue_key}")
+
+    cloud_id = resolve_sites([site])[0]["id"] if site else None
+    parent = fetch_issues_by_keys([issue_key], cloud_id=cloud_id)
+    if parent.empty:
+        print(f"Issue {issue_key} not found.")
+        return None, None
+
+    df = load_descendants(issue_key, cloud_id=cloud_id)
+    if df.empty:
+        print(f"No child issues found for {issue_key}.")
+        return None, None
+
+    if level:
+        level_value = HIERARCHY_LEVELS[level]
+    else:
+        level_value = int(parent["IssueTypeHierarchy"].iloc[0]) - 1
+
+    df = rollup(pd.concat([parent, df], ignore_index=True), level_value)
+    df = df[df["Key"] != issue_key]
+    if df.empty:
+        print(f"No child issues of {issue_key} at the requested level.")
+        return None, None
+
+    return df, f"Gantt Chart for {issue_key}: {parent['Summary'].iloc[0]}"
+
+def assign_lanes(df):
+    # Greedy swimlane stacking per team over plain arrays instead of iterrows
+    df = df.sort_values(by=["Team", "StartDate", "AdjustedEnd"])
+    teams = df["Team"].to_numpy()
+    starts = df["StartDate"].to_numpy()
+    ends = df["AdjustedEnd"].to_numpy()
+
+    lanes = np.empty(len(df), dtype=np.int64)
+    end_times = []
+    current_team = None
+
+    for i in range(len(df)):
+        if teams[i] != current_team:
+            current_team = teams[i]
+            end_times = []
+        for lane_num, lane_end in enumerate(end_times):
+            if starts[i] > lane_end:
+                end_times[lane_num] = ends[i]
+                lanes[i] = lane_num
+                break
+        else:
+            end_times.append(ends[i])
+            lanes[i] = len(end_times) - 1
+
+    df["Lane"] = lanes
+    return df
+
+def prepare_bars(df, calendars=None):
+    df = df.dropna(subset=["StartDate", "TargetEnd"]).copy()
+    if df.empty:
+        return None
+
+    df["StartDate"] = pd.to_datetime(df["StartDate"])
+    df["TargetEnd"] = pd.to_datetime(df["TargetEnd"])
+    df["Team"] = df["Team"].fillna("Unassigned").astype(str)
+
+    # Bars end after the last working day on or before the target end
+    df = add_working_day_columns(df, calendars=calendars)
+
+    duration = df["AdjustedEnd"] - df["StartDate"]
+    df["width"] = duration.dt.total_seconds() * 1000
+    df["center"] = df["StartDate"] + duration / 2
+
+    bar_width_px = df["width"] / MS_PER_PX
+    key_width_px = df["Key"].str.len() * CHAR_PIXELS
+    df["label_above"] = (key_width_px + LABEL_PADDING) > bar_width_px
+    return df
+
+def prepare_gantt_layout(df, calendars=None):
+    df = prepare_bars(df, calendars=calendars)
+    if df is None:
+        print("No issues with valid StartDate and TargetEnd to plot.")
+        return None
+
+    df = assign_lanes(df)
+
+    # Multi-site charts keep the site so keys stay unique downstream
+    columns = LAYOUT_COLUMNS + (["Site"] if "Site" in df else [])
+    layout = df[columns].reset_index(drop=True)
+    return layout.astype({"Lane": "int64", "label_above": "bool", "width": "float64"})
+
+def add_dependency_analysis(layout, df):
+    if "Blocks" not in df:
+        print("Issue links are not available for this chart; skipping dependencies.")
+        return layout, None
+
+    # Only issues drawn on the chart take part in the schedule, in layout row order
+    links = pd.DataFrame({
+        "Node": node_keys(df),
+        "Blocks": df["Blocks"].to_numpy(),
+        "BlockedBy": df["BlockedBy"].to_numpy()
+    }).drop_duplicates(subset="Node").set_index("Node")
+    issues = layout.copy()
+    issues[["Blocks", "BlockedBy"]] = links.reindex(node_keys(layout)).to_numpy()
+    edges = dependency_edges(issues)
+
+    durations = layout["WorkingDays"].where(layout["WorkingDays"] > 0)
+    starts = working_day_offsets(layout["StartDate"])
+    schedule, edges = critical_path(issues, durations, edges=edges, starts=starts)
+
+    cycles = schedule.loc[schedule["InCycle"], "Key"].tolist()
+    if cycles:
+        print(f"Warning: dependency cycle between {', '.join(cycles)}")
+    print(f"{len(edges)} dependencies, {int(schedule['Critical'].sum())} issues on the critical path")
+
+    layout = layout.copy()
+    layout[["Slack", "Critical", "InCycle"]] = schedule[["Slack", "Critical", "InCycle"]].to_numpy()
+    return layout.astype({"Slack": "float64", "Critical": "bool", "InCycle": "bool"}), edges
+
+def render_gantt(layout, title, renderers=("bokeh",), export_path=None, **options):
+    if export_path:
+        layout.to_csv(export_path, index=False)
+        print(f"Exported chart data to {export_path}")
+
+    for name in renderers:
+        get_renderer(name)(layout, title, **options)
+
+def run_gantt(df, title, renderers=("bokeh",), export_path=None, dependencies=False, **options):
+    if df is None:
+        return
+    layout = prepare_gantt_layout(df)
+    if layout is None:
+        return
+    if dependencies:
+        layout, options["dependency_edges"] = add_dependency_analysis(layout, df)
+    render_gantt(layout, title, renderers=renderers, export_path=export_path, **options)
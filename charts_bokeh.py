@@ -3,105 +3,38 @@ import numpy as np
 import tempfile
 import os
 from bokeh.io import output_file, save
+from bokeh.layouts import column
+from bokeh.palettes import Category10
 from bokeh.plotting import figure
-from bokeh.models import ColumnDataSource, FactorRange, HoverTool, LabelSet, DatetimeTicker, Span
-from jira_client import api_request
-from jira_parser import parse_issues_to_dataframe
-
-def assign_lanes(df):
-    df = df.sort_values(by=["StartDate", "AdjustedEnd"]).copy()
-    lanes = []
-    end_times = []
-
-    for _, row in df.iterrows():
-        assigned = False
-        for lane_num, lane_end in enumerate(end_times):
-            if row["StartDate"] > lane_end:
-                end_times[lane_num] = row["AdjustedEnd"]
-                lanes.append(lane_num)
-                assigned = True
-                break
-        if not assigned:
-            end_times.append(row["AdjustedEnd"])
-            lanes.append(len(end_times) - 1)
-    df["Lane"] = lanes
-    return df
-
-def gantt_chart_for_sprint_bokeh(sprint_name, export_path=None):
-    print(f"Querying issues for sprint: {sprint_name}")
-
-    jql = f'Sprint = "{sprint_name}"'
-    result = api_request(endpoint="search", params={"jql": jql}, paginate=True)
-    df = parse_issues_to_dataframe(result)
+from bokeh.models import ColumnDataSource, FactorRange, HoverTool, LabelSet, FixedTicker, Span
+from calendars import working_day_ticks
+from dependencies import node_keys
 
-    if df.empty:
-        print("No issues found for this sprint.")
-        return
+WORKING_DAY_TICK_MAX_DAYS = 42
 
-    df = df.dropna(subset=["StartDate", "TargetEnd"])
-    if df.empty:
-        print("No issues with valid StartDate and TargetEnd to plot.")
-        return
+def lane_factors(layout):
+    max_lanes = layout.groupby("Team", sort=False)["Lane"].max()
+    return [(team, str(lane)) for team, top in max_lanes.items() for lane in range(top + 1)]
 
-    df["StartDate"] = pd.to_datetime(df["StartDate"])
-    df["TargetEnd"] = pd.to_datetime(df["TargetEnd"])
-    df["Team"] = df["Team"].fillna("Unassigned")
-    df["AdjustedEnd"] = df["TargetEnd"] + pd.Timedelta(days=1)
-
-    # Assign lanes
-    stacked = []
-    for team, group in df.groupby("Team"):
-        group = assign_lanes(group)
-        group["Swimlane"] = group["Team"] + f" (lane " + group["Lane"].astype(str) + ")"
-        stacked.append(group)
-
-    df_stacked = pd.concat(stacked)
+def gantt_source_data(layout):
+    df_stacked = layout.copy()
     df_stacked["y"] = list(zip(df_stacked["Team"], df_stacked["Lane"].astype(str)))
-    df_stacked["width"] = (df_stacked["AdjustedEnd"] - df_stacked["StartDate"]).dt.total_seconds() * 1000
-    df_stacked["center"] = df_stacked["StartDate"] + (df_stacked["AdjustedEnd"] - df_stacked["StartDate"]) / 2
-
-    # === Adaptive label logic with debug support ===
-    CHAR_PIXELS = 30         # More conservative estimate, tune for your font
-    PX_PER_DAY = 100        # Chart's x-scaling; increase if bars appear too short
-    MS_PER_DAY = 86400000
-    MS_PER_PX = MS_PER_DAY / PX_PER_DAY
-    LABEL_PADDING = 50      # Extra space to prevent near-overflow
-
-    def should_label_be_above(row):
-        bar_width_px = row["width"] / MS_PER_PX
-        key_width_px = len(row["Key"]) * CHAR_PIXELS
-        # DEBUG: print out actual numbers to tune further
-        print(f"{row['Key']}: bar_width={bar_width_px:.1f}px, key_width={key_width_px}px, inside={key_width_px + LABEL_PADDING <= bar_width_px}")
-        return key_width_px + LABEL_PADDING > bar_width_px
-
-    df_stacked["label_above"] = df_stacked.apply(should_label_be_above, axis=1)
-
-    export_columns = [
-        'y', 'StartDate', 'TargetEnd', 'AdjustedEnd', 'width', 'center',
-        'Key', 'Summary', 'Assignee', 'label_above'
-    ]
-    df_stacked = df_stacked[export_columns]
-
-    if export_path:
-        df_stacked.to_csv(export_path, index=False)
-        print(f"Exported chart data to {export_path}")
-
-    teams = list(df_stacked["y"].apply(lambda t: t[0]).unique())
-    max_lanes = df_stacked.groupby(df_stacked["y"].apply(lambda t: t[0]))["y"].apply(
-        lambda s: max(int(lane[1]) for lane in s)
-    )
+    df_stacked["label_offset"] = np.where(df_stacked["label_above"], 15, 0)
+    df_stacked["label_baseline"] = np.where(df_stacked["label_above"], "bottom", "middle")
 
-    factors = []
-    for team in teams:
-        for lane in range(max_lanes[team] + 1):
-            factors.append((team, str(lane)))
+    # Critical-path bars get a heavy red outline when dependencies are analysed
+    critical = df_stacked["Critical"].fillna(False).astype(bool) if "Critical" in df_stacked else False
+    df_stacked["bar_line_color"] = np.where(critical, "crimson", "black")
+    df_stacked["bar_line_width"] = np.where(critical, 3, 1)
+    return ColumnDataSource.from_df(df_stacked)
 
-    source_inside = ColumnDataSource(df_stacked[df_stacked["label_above"] == False].reset_index(drop=True))
-    source_above = ColumnDataSource(df_stacked[df_stacked["label_above"] == True].reset_index(drop=True))
-    source_all = ColumnDataSource(df_stacked.reset_index(drop=True))
+def build_gantt_figure(layout, title, source=None):
+    factors = lane_factors(layout)
+    if source is None:
+        source = ColumnDataSource(gantt_source_data(layout))
 
     p = figure(
-        title=f"Gantt Chart for Sprint: {sprint_name}",
+        title=title,
         x_axis_type="datetime",
         height=300 + 55 * len(factors),
         width=1200,
@@ -110,32 +43,22 @@ def gantt_chart_for_sprint_bokeh(sprint_name, export_path=None):
         toolbar_location="above"
     )
 
-    p.rect(x='center', y='y', width='width', height=0.55, source=source_all, fill_color="steelblue", line_color="black")
+    p.rect(x='center', y='y', width='width', height=0.55, source=source, fill_color="steelblue",
+           line_color='bar_line_color', line_width='bar_line_width')
 
-    labels_inside = LabelSet(
+    # Narrow bars get their label above the bar instead of inside it
+    labels = LabelSet(
         x='center',
         y='y',
         text='Key',
-        source=source_inside,
+        source=source,
         text_align='center',
-        text_baseline='middle',
+        y_offset='label_offset',
+        text_baseline='label_baseline',
         text_font_size='9pt',
         text_color='black'
     )
-    p.add_layout(labels_inside)
-
-    labels_above = LabelSet(
-        x='center',
-        y='y',
-        text='Key',
-        source=source_above,
-        text_align='center',
-        y_offset=15,          # Bumped up for more clearance
-        text_baseline='bottom',
-        text_font_size='9pt',
-        text_color='black'      # RED for debug; change to 'black' when happy!
-    )
-    p.add_layout(labels_above)
+    p.add_layout(labels)
 
     hover = HoverTool(
         tooltips=[
@@ -143,18 +66,20 @@ def gantt_chart_for_sprint_bokeh(sprint_name, export_path=None):
             ("Summary", "@Summary"),
             ("Assignee", "@Assignee"),
             ("Start", "@StartDate{%Y-%m-%d}"),
-            ("End", "@TargetEnd{%Y-%m-%d}")
-        ],
+            ("End", "@TargetEnd{%Y-%m-%d}"),
+            ("Working days", "@WorkingDays"),
+            ("Slip (working days)", "@SlipDays")
+        ] + ([("Slack (working days)", "@Slack")] if "Slack" in layout else []),
         formatters={"@StartDate": "datetime", "@TargetEnd": "datetime"}
     )
     p.add_tools(hover)
 
-    min_date = df_stacked["StartDate"].min()
-    max_date = df_stacked["AdjustedEnd"].max()
-    total_days = (max_date - min_date).days + 1
-
-    p.xaxis.ticker = DatetimeTicker()
-    p.xaxis.ticker.desired_num_ticks = total_days
+    # Short charts tick on each working day of the default calendar; longer
+    # ones keep Bokeh's adaptive datetime ticks so labels never pile up
+    start, end = layout["StartDate"].min(), layout["AdjustedEnd"].max()
+    if end - start <= pd.Timedelta(days=WORKING_DAY_TICK_MAX_DAYS):
+        ticks = working_day_ticks(start, end)
+        p.xaxis.ticker = FixedTicker(ticks=(ticks.astype("datetime64[ms]").astype("int64")).tolist())
 
     now = pd.Timestamp.now().normalize()
     today_line = Span(location=now.value / 1e6, dimension='height',
@@ -167,7 +92,72 @@ def gantt_chart_for_sprint_bokeh(sprint_name, export_path=None):
     p.xaxis.axis_label = "Date"
     p.xaxis.major_label_orientation = 0.785
 
+    return p
+
+def add_dependency_overlay(p, layout, edges):
+    # Draw each dependency from the end of the blocking bar to the start of the blocked bar
+    bars = layout.set_index(node_keys(layout))
+    y = pd.Series(list(zip(bars["Team"], bars["Lane"].astype(str))), index=bars.index)
+
+    source = ColumnDataSource({
+        "x0": bars.loc[edges["Source"], "AdjustedEnd"].to_numpy(),
+        "y0": y.loc[edges["Source"]].tolist(),
+        "x1": bars.loc[edges["Target"], "StartDate"].to_numpy(),
+        "y1": y.loc[edges["Target"]].tolist(),
+        "color": np.where(edges["Critical"], "crimson", "gray"),
+        "width": np.where(edges["Critical"], 2.5, 1.2)
+    })
+
+    p.segment(x0="x0", y0="y0", x1="x1", y1="y1", source=source, line_color="color", line_width="width", line_alpha=0.8)
+    p.scatter(x="x1", y="y1", source=source, marker="triangle", angle=-np.pi / 2, size=8,
+              fill_color="color", line_color="color")
+
+def render_gantt_bokeh(layout, title, dependency_edges=None, **options):
+    p = build_gantt_figure(layout, title)
+    if dependency_edges is not None and len(dependency_edges):
+        add_dependency_overlay(p, layout, dependency_edges)
+
     with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmpfile:
         output_file(tmpfile.name)
         save(p)
         os.startfile(tmpfile.name)
+
+def rolling_percentile_chart_bokeh(df, title):
+    if df.empty:
+        print("No resolved issues to chart for this selection.")
+        return
+
+    percentile_columns = [c for c in df.columns if c.startswith("P") and c[1:].isdigit()]
+    colors = Category10[10]
+
+    plots = []
+    for metric, group in df.groupby("Metric", sort=False):
+        source = ColumnDataSource(group.reset_index(drop=True))
+        p = figure(
+            title=f"{title}: {metric}",
+            x_axis_type="datetime",
+            height=350,
+            width=1200,
+            tools="xpan,xwheel_zoom,reset,save",
+            toolbar_location="above"
+        )
+        for i, column_name in enumerate(percentile_columns):
+            p.line(x="Period", y=column_name, source=source, line_width=2,
+                   color=colors[i % len(colors)], legend_label=column_name)
+            p.scatter(x="Period", y=column_name, source=source, size=5, color=colors[i % len(colors)])
+
+        hover = HoverTool(
+            tooltips=[("Week", "@Period{%Y-%m-%d}"), ("Issues", "@Count")] +
+                     [(c, f"@{c}{{0.0}} days") for c in percentile_columns],
+            formatters={"@Period": "datetime"}
+        )
+        p.add_tools(hover)
+        p.legend.location = "top_left"
+        p.yaxis.axis_label = "Days"
+        p.xaxis.axis_label = "Week resolved"
+        plots.append(p)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmpfile:
+        output_file(tmpfile.name)
+        save(column(*plots))
+        os.startfile(tmpfile.name)
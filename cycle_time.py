@@ -0,0 +1,137 @@
+import json
+import pandas as pd
+from jira_client import iter_pages
+from jira_parser import parse_issues_to_dataframe
+from sketches import DurationSketch
+
+METRICS = ["LeadTime", "CycleTime"]
+PERCENTILES = [0.5, 0.85, 0.95]
+SKETCH_DIMENSIONS = ["Metric", "Team", "IssueType", "Period"]
+SECONDS_PER_DAY = 86400
+
+# Lead time runs from Created to Resolved. Jira search results carry no
+# status history, so cycle time runs from the StartDate field to Resolved.
+def compute_durations(df):
+    resolved = pd.to_datetime(df["Resolved"], utc=True, errors="coerce")
+    created = pd.to_datetime(df["Created"], utc=True, errors="coerce")
+    started = pd.to_datetime(df["StartDate"], errors="coerce").dt.tz_localize("UTC")
+
+    durations = pd.DataFrame({
+        "Key": df["Key"],
+        "Team": df["Team"].fillna("Unassigned"),
+        "IssueType": df["IssueType"].fillna("Unknown"),
+        "Period": resolved.dt.tz_localize(None).dt.to_period("W").dt.start_time.dt.strftime("%Y-%m-%d"),
+        "LeadTime": (resolved - created).dt.total_seconds() / SECONDS_PER_DAY,
+        "CycleTime": (resolved - started).dt.total_seconds() / SECONDS_PER_DAY
+    })
+    return durations[resolved.notna()]
+
+def update_sketches(sketches, durations):
+    long = durations.melt(
+        id_vars=["Team", "IssueType", "Period"],
+        value_vars=METRICS,
+        var_name="Metric",
+        value_name="Days"
+    ).dropna(subset=["Days"])
+    long = long[long["Days"] >= 0]
+
+    for key, group in long.groupby(SKETCH_DIMENSIONS, sort=False):
+        sketches.setdefault(key, DurationSketch()).update(group["Days"].to_numpy())
+    return sketches
+
+def merge_sketches(target, other):
+    for key, sketch in other.items():
+        if key in target:
+            target[key].merge(sketch)
+        else:
+            target[key] = sketch
+    return target
+
+def collect_sketches(jql):
+    # Stream the search page by page; only the sketches are kept in memory
+    sketches = {}
+    issue_count = 0
+    negative_count = 0
+    for page in iter_pages(endpoint="search", params={"jql": jql}):
+        df = parse_issues_to_dataframe(page)
+        if df.empty:
+            continue
+        issue_count += len(df)
+        durations = compute_durations(df)
+        negative_count += int((durations[METRICS] < 0).to_numpy().sum())
+        update_sketches(sketches, durations)
+        print(f"Processed {issue_count} issues...")
+
+    if negative_count:
+        print(f"Skipped {negative_count} negative durations (start date or creation after resolution).")
+    return sketches
+
+def save_sketches(path, sketches):
+    data = [{"key": list(key), "sketch": sketch.to_dict()} for key, sketch in sketches.items()]
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+def load_sketches(paths):
+    sketches = {}
+    for path in paths:
+        with open(path, "r") as f:
+            data = json.load(f)
+        shard = {tuple(item["key"]): DurationSketch.from_dict(item["sketch"]) for item in data}
+        merge_sketches(sketches, shard)
+    return sketches
+
+def group_sketches(sketches, dimensions):
+    positions = [SKETCH_DIMENSIONS.index(d) for d in dimensions]
+    grouped = {}
+    for key, sketch in sketches.items():
+        group_key = tuple(key[p] for p in positions)
+        if group_key not in grouped:
+            grouped[group_key] = DurationSketch(sketch.relative_accuracy)
+        grouped[group_key].merge(sketch)
+    return grouped
+
+def percentile_row(sketch):
+    row = {"Count": sketch.count, "MeanDays": sketch.mean()}
+    for q in PERCENTILES:
+        row[f"P{int(q * 100)}"] = sketch.quantile(q)
+    return row
+
+def summary_table(sketches):
+    rows = []
+    for dimension in [None, "Team", "IssueType"]:
+        dimensions = ["Metric"] + ([dimension] if dimension else [])
+        for key, sketch in sorted(group_sketches(sketches, dimensions).items()):
+            row = {
+                "Metric": key[0],
+                "Dimension": dimension or "All",
+                "Group": key[1] if dimension else "All"
+            }
+            row.update(percentile_row(sketch))
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+def rolling_percentiles(sketches, window_weeks=4, team=None):
+    if team:
+        sketches = {k: v for k, v in sketches.items() if k[1] == team}
+
+    weekly = group_sketches(sketches, ["Metric", "Period"])
+    if not weekly:
+        return pd.DataFrame()
+
+    periods = sorted({period for _, period in weekly})
+    weeks = pd.date_range(periods[0], periods[-1], freq="7D").strftime("%Y-%m-%d")
+
+    rows = []
+    for metric in METRICS:
+        for i, week in enumerate(weeks):
+            window = DurationSketch()
+            for previous in weeks[max(0, i - window_weeks + 1):i + 1]:
+                sketch = weekly.get((metric, previous))
+                if sketch:
+                    window.merge(sketch)
+            if window.count == 0:
+                continue
+            row = {"Metric": metric, "Period": pd.Timestamp(week)}
+            row.update(percentile_row(window))
+            rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+# Issue keys are only unique within a site, so graph nodes on multi-site
+# charts are site-qualified keys such as "acme:PROJ-1"
+def node_prefixes(df):
+    if "Site" in df:
+        return df["Site"].astype(str) + ":"
+    return pd.Series("", index=df.index)
+
+def qualify(prefixes, keys):
+    # Exploded link columns are object dtype (empty when nothing is linked), so
+    # add as objects to avoid string/object dtype clashes
+    return (prefixes.astype(object) + keys.astype(object)).to_numpy()
+
+def node_keys(df):
+    return qualify(node_prefixes(df), df["Key"])
+
+# Edges point from the blocking issue to the issue it blocks; links never cross sites
+def dependency_edges(df):
+    if "Blocks" not in df or "BlockedBy" not in df:
+        return pd.DataFrame(columns=["Source", "Target"])
+
+    nodes = pd.DataFrame({
+        "Node": node_keys(df),
+        "Prefix": node_prefixes(df).to_numpy(),
+        "Blocks": df["Blocks"].to_numpy(),
+        "BlockedBy": df["BlockedBy"].to_numpy()
+    })
+    outward = nodes[["Node", "Prefix", "Blocks"]].explode("Blocks").dropna()
+    inward = nodes[["Node", "Prefix", "BlockedBy"]].explode("BlockedBy").dropna()
+    edges = pd.concat([
+        pd.DataFrame({"Source": outward["Node"].to_numpy(), "Target": qualify(outward["Prefix"], outward["Blocks"])}),
+        pd.DataFrame({"Source": qualify(inward["Prefix"], inward["BlockedBy"]), "Target": inward["Node"].to_numpy()})
+    ], ignore_index=True)
+
+    # Only links between fetched issues can be drawn or scheduled
+    known = set(nodes["Node"])
+    edges = edges[edges["Source"].isin(known) & edges["Target"].isin(known) & (edges["Source"] != edges["Target"])]
+    return edges.drop_duplicates().reset_index(drop=True)
+
+# Compressed adjacency index: successors of node i are targets[offsets[i]:offsets[i + 1]]
+def build_adjacency(keys, edges):
+    position = pd.Index(keys)
+    sources = position.get_indexer(edges["Source"])
+    targets = position.get_indexer(edges["Target"])
+
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.add.at(offsets, sources + 1, 1)
+    return np.cumsum(offsets), targets[order], sources, targets
+
+def topological_order(offsets, successors, targets, node_count):
+    # Kahn's algorithm; nodes that never reach in-degree zero sit on or behind a cycle
+    indegree = np.bincount(targets, minlength=node_count)
+    queue = list(np.flatnonzero(indegree == 0))
+    order = []
+
+    while queue:
+        node = queue.pop()
+        order.append(node)
+        for succ in successors[offsets[node]:offsets[node + 1]]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                queue.append(succ)
+
+    return np.array(order, dtype=np.int64)
+
+def connected_components(node_count, sources, targets):
+    # Label propagation with pointer jumping; each node ends with its component's smallest index
+    labels = np.arange(node_count)
+    while True:
+        previous = labels.copy()
+        np.minimum.at(labels, sources, labels[targets])
+        np.minimum.at(labels, targets, labels[sources])
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+# Rows of the result line up with the rows of df. starts are planned start
+# offsets (e.g. working days from the chart start); issues cannot begin earlier.
+# Each linked group of issues is scheduled against its own end, and only
+# issues in a dependency chain can be critical.
+def critical_path(df, durations, edges=None, starts=None):
+    keys = node_keys(df)
+    node_count = len(keys)
+    edges = dependency_edges(df) if edges is None else edges
+    offsets, successors, sources, targets = build_adjacency(keys, edges)
+    order = topological_order(offsets, successors, targets, node_count)
+
+    unscheduled = np.ones(node_count, dtype=bool)
+    unscheduled[order] = False
+
+    # Peeling the reversed graph too leaves only nodes on (or between) cycles;
+    # the rest of the unscheduled nodes are merely downstream of one
+    reversed_edges = pd.DataFrame({"Source": edges["Target"], "Target": edges["Source"]})
+    r_offsets, r_successors, _, r_targets = build_adjacency(keys, reversed_edges)
+    in_cycle = np.ones(node_count, dtype=bool)
+    in_cycle[topological_order(r_offsets, r_successors, r_targets, node_count)] = False
+    in_cycle &= unscheduled
+
+    durations = np.nan_to_num(np.asarray(durations, dtype=float), nan=1.0)
+    earliest_start = np.zeros(node_count) if starts is None else np.nan_to_num(np.asarray(starts, dtype=float), nan=0.0)
+
+    # Forward pass in topological order
+    for node in order:
+        finish = earliest_start[node] + durations[node]
+        succ = successors[offsets[node]:offsets[node + 1]]
+        if len(succ):
+            earliest_start[succ] = np.maximum(earliest_start[succ], finish)
+    earliest_finish = earliest_start + durations
+
+    components = connected_components(node_count, sources, targets)
+    component_end = np.full(node_count, -np.inf)
+    np.maximum.at(component_end, components[order], earliest_finish[order])
+    latest_finish = component_end[components]
+
+    # Backward pass in reverse topological order
+    for node in order[::-1]:
+        succ = successors[offsets[node]:offsets[node + 1]]
+        succ = succ[~unscheduled[succ]]
+        if len(succ):
+            latest_finish[node] = (latest_finish[succ] - durations[succ]).min()
+    latest_start = latest_finish - durations
+    slack = latest_start - earliest_start
+
+    # Slack is meaningless for issues with no dependencies at all
+    linked = np.zeros(node_count, dtype=bool)
+    linked[sources] = True
+    linked[targets] = True
+
+    result = pd.DataFrame({
+        "Key": df["Key"].to_numpy(),
+        "EarliestStart": earliest_start,
+        "EarliestFinish": earliest_finish,
+        "LatestStart": latest_start,
+        "LatestFinish": latest_finish,
+        "Slack": slack,
+        "Critical": np.isclose(slack, 0) & ~unscheduled & linked,
+        "InCycle": in_cycle
+    })
+    result.loc[unscheduled, ["EarliestStart", "EarliestFinish", "LatestStart", "LatestFinish", "Slack"]] = np.nan
+    result.loc[~linked, ["LatestStart", "LatestFinish", "Slack"]] = np.nan
+
+    # A dependency is critical when it links two critical issues back to back
+    by_key = result.set_index(keys)
+    edges = edges.copy()
+    edges["Critical"] = (
+        edges["Source"].map(by_key["Critical"]).to_numpy() &
+        edges["Target"].map(by_key["Critical"]).to_numpy() &
+        np.isclose(edges["Source"].map(by_key["EarliestFinish"]).to_numpy(dtype=float),
+                   edges["Target"].map(by_key["EarliestStart"]).to_numpy(dtype=float))
+    )
+    return result, edges
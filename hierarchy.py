@@ -0,0 +1,150 @@
+import pandas as pd
+from jira_client import api_request
+from jira_parser import parse_issues_to_dataframe
+
+# Jira issue type hierarchy levels
+HIERARCHY_LEVELS = {
+    "subtask": -1,
+    "story": 0,
+    "epic": 1,
+    "initiative": 2
+}
+
+MAX_HIERARCHY_DEPTH = 10
+KEY_BATCH_SIZE = 100
+
+def fetch_issues_by_keys(keys, cloud_id=None):
+    keys = sorted(keys)
+    frames = []
+    for i in range(0, len(keys), KEY_BATCH_SIZE):
+        batch = keys[i:i + KEY_BATCH_SIZE]
+        jql = f"key in ({','.join(batch)})"
+        # Deleted or unbrowsable keys only produce warnings instead of failing the batch
+        params = {"jql": jql, "validateQuery": "warn"}
+        try:
+            result = api_request(endpoint="search", params=params, paginate=True, cloud_id=cloud_id)
+        except Exception as e:
+            print(f"Warning: could not fetch issues {batch[0]}..{batch[-1]}: {e}")
+            continue
+        frames.append(parse_issues_to_dataframe(result))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+def load_ancestors(df, cloud_id=None):
+    # Walk up the parent chain, fetching one hierarchy level per round trip
+    frames = [df]
+    known = set(df["Key"])
+    pending = set(df["ParentKey"].dropna()) - known
+
+    while pending:
+        parents = fetch_issues_by_keys(pending, cloud_id=cloud_id)
+        if parents.empty:
+            break
+        frames.append(parents)
+        known |= set(parents["Key"])
+        pending = set(parents["ParentKey"].dropna()) - known
+
+    return pd.concat(frames, ignore_index=True).drop_duplicates(subset="Key")
+
+def load_descendants(key, cloud_id=None):
+    # Drill-down: only fetch the levels below the selected issue on demand
+    frames = []
+    known = {key}
+    pending = {key}
+
+    while pending:
+        keys = ",".join(sorted(pending))
+        jql = f'parent in ({keys}) OR "Epic Link" in ({keys})'
+        result = api_request(endpoint="search", params={"jql": jql}, paginate=True, cloud_id=cloud_id)
+        children = parse_issues_to_dataframe(result)
+        if children.empty:
+            break
+        children = children[~children["Key"].isin(known)]
+        frames.append(children)
+        known |= set(children["Key"])
+        pending = set(children["Key"])
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).drop_duplicates(subset="Key")
+
+def assign_ancestors(df, level):
+    lookup = df.drop_duplicates(subset="Key").set_index("Key")
+    parent_of = lookup["ParentKey"]
+    level_of = pd.to_numeric(lookup["IssueTypeHierarchy"], errors="coerce")
+
+    current = df["Key"]
+    current_level = pd.to_numeric(df["IssueTypeHierarchy"], errors="coerce")
+
+    # Climb every row one level per pass until it reaches the requested level
+    for _ in range(MAX_HIERARCHY_DEPTH):
+        climbing = current_level < level
+        if not climbing.any():
+            break
+        current = current.where(~climbing, current.map(parent_of))
+        current_level = current_level.where(~climbing, current.map(level_of))
+
+    df = df.copy()
+    df["RollupKey"] = current.where(current_level == level)
+    return df
+
+def rollup(df, level):
+    if isinstance(level, str):
+        level = HIERARCHY_LEVELS[level]
+
+    df = df.copy()
+    df["StartDate"] = pd.to_datetime(df["StartDate"])
+    df["TargetEnd"] = pd.to_datetime(df["TargetEnd"])
+    df["Resolved"] = pd.to_datetime(df["Resolved"], utc=True, errors="coerce")
+    df["StoryPoints"] = pd.to_numeric(df["StoryPoints"], errors="coerce")
+
+    df = assign_ancestors(df, level)
+    orphans = df["RollupKey"].isna() & (pd.to_numeric(df["IssueTypeHierarchy"], errors="coerce") <= level)
+    if orphans.any():
+        print(f"{int(orphans.sum())} issues have no ancestor at this level and are left out of the roll-up.")
+    df = df.dropna(subset=["RollupKey"])
+    if df.empty:
+        return pd.DataFrame()
+
+    grouped = df.groupby("RollupKey")
+    spans = grouped.agg(StartDate=("StartDate", "min"), TargetEnd=("TargetEnd", "max"))
+
+    # Child stats cover only the level directly below, so intermediate containers
+    # and subtasks are not counted twice; points are summed where they are estimated
+    row_level = pd.to_numeric(df["IssueTypeHierarchy"], errors="coerce")
+    children = df[row_level == level - 1]
+    estimated = df[row_level == min(level, HIERARCHY_LEVELS["story"])]
+
+    child_stats = children.groupby("RollupKey").agg(
+        ChildCount=("Key", "size"),
+        ChildTeam=("Team", "first"),
+        ChildResolved=("Resolved", "max"),
+        ChildOpen=("Resolved", lambda r: r.isna().sum())
+    )
+    points = estimated.groupby("RollupKey")["StoryPoints"].sum().rename("StoryPoints")
+    status_mix = pd.crosstab(children["RollupKey"], children["StatusCategory"].fillna("Unknown"))
+    status_mix.columns = [f"Status_{c.replace(' ', '')}" for c in status_mix.columns]
+
+    own = df[df["Key"] == df["RollupKey"]].set_index("Key")[
+        ["Summary", "Status", "StatusCategory", "Assignee", "Team", "Sprint", "IssueType", "IssueTypeHierarchy",
+         "ParentKey", "Resolved"]
+    ]
+
+    result = spans.join([child_stats, points, status_mix, own])
+    result["Team"] = result["Team"].fillna(result["ChildTeam"])
+    result["ChildCount"] = result["ChildCount"].fillna(0).astype(int)
+    result["StoryPoints"] = result["StoryPoints"].fillna(0)
+    status_columns = list(status_mix.columns)
+    result[status_columns] = result[status_columns].fillna(0).astype(int)
+    if "Status_Done" in result:
+        result["PercentDone"] = (result["Status_Done"] / result["ChildCount"].where(result["ChildCount"] > 0)).fillna(0) * 100
+
+    # A rolled-up bar is resolved when its last child is; childless bars keep their own date
+    has_children = result["ChildCount"] > 0
+    all_resolved = result["ChildOpen"] == 0
+    result["Resolved"] = result["Resolved"].where(~has_children, result["ChildResolved"].where(all_resolved))
+
+    result = result.drop(columns=["ChildTeam", "ChildResolved", "ChildOpen"])
+    result.index.name = "Key"
+    return result.reset_index()
@@ -8,6 +8,8 @@ from urllib.parse import urlparse, parse_qs
 from dotenv import load_dotenv
 from requests_oauthlib import OAuth2Session
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 
 # Load env variables
 load_dotenv()
@@ -23,6 +25,14 @@ SCOPES = ["read:jira-work", "offline_access"]
 TOKEN_FILE = "token.json"
 CLOUD_FILE = "cloud.json"
 
+# Connection pooling shared by all requests (and all sites) in a run
+POOL_SIZE = 16
+SITE_WORKERS = 8
+
+session_cache = {}
+session_lock = threading.Lock()
+refresh_lock = threading.Lock()
+
 # OAuth Callback Server
 class OAuthCallbackHandler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -68,8 +78,7 @@ def oauth_flow():
     )
     save_token(token)
 
-    cloud_id = fetch_cloud_id(token)
-    save_cloud_id(cloud_id)
+    save_sites(fetch_accessible_resources(token))
 
     return token
 
@@ -95,6 +104,21 @@ def load_cloud_id():
             return json.load(f)["cloud_id"]
     return None
 
+# All accessible sites; cloud_id stays the default site for single-site calls
+def save_sites(resources):
+    sites = [{"id": r["id"], "name": r.get("name"), "url": r.get("url")} for r in resources]
+    cloud_id = load_cloud_id()
+    if cloud_id not in [site["id"] for site in sites]:
+        cloud_id = sites[0]["id"]
+    with open(CLOUD_FILE, "w") as f:
+        json.dump({"cloud_id": cloud_id, "sites": sites}, f, indent=4)
+
+def load_sites():
+    if os.path.exists(CLOUD_FILE):
+        with open(CLOUD_FILE, "r") as f:
+            return json.load(f).get("sites")
+    return None
+
 # Manual refresh token handling (direct requests)
 def refresh_token(token):
     print("Refreshing token...")
@@ -116,66 +140,147 @@ def get_token():
         return token
     return oauth_flow()
 
+# Concurrent requests may all hit a 401; only the first one refreshes
+def refresh_token_once(stale_token):
+    with refresh_lock:
+        current = load_token()
+        if current and current.get("access_token") != stale_token.get("access_token"):
+            return current
+        return refresh_token(stale_token)
+
+def get_session(token):
+    key = token.get("access_token")
+    with session_lock:
+        session = session_cache.get(key)
+        if session is None:
+            session = OAuth2Session(CLIENT_ID, token=token)
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session_cache.clear()
+            session_cache[key] = session
+    return session
+
 # Cloud ID discovery
-def fetch_cloud_id(token):
-    oauth = OAuth2Session(CLIENT_ID, token=token)
+def fetch_accessible_resources(token):
+    oauth = get_session(token)
     response = oauth.get(f"{API_BASE_URL}/oauth/token/accessible-resources")
     response.raise_for_status()
-    cloud_ids = response.json()
-    if not cloud_ids:
+    resources = response.json()
+    if not resources:
         raise Exception("No accessible Jira resources found.")
-    return cloud_ids[0]["id"]
+    return resources
 
-# Main API request with refresh handling and optional pagination
-def api_request(endpoint, method="GET", params=None, data=None, paginate=False):
-    token = get_token()
+def fetch_cloud_id(token):
+    return fetch_accessible_resources(token)[0]["id"]
+
+def default_cloud_id(token):
     cloud_id = load_cloud_id()
     if not cloud_id:
-        cloud_id = fetch_cloud_id(token)
-        save_cloud_id(cloud_id)
+        save_sites(fetch_accessible_resources(token))
+        cloud_id = load_cloud_id()
+    return cloud_id
 
-    url = f"{API_BASE_URL}/ex/jira/{cloud_id}/rest/api/3/{endpoint}"
-    oauth = OAuth2Session(CLIENT_ID, token=token)
+# Site selectors may be cloud ids, site names, site URLs or "all"
+def resolve_sites(selectors):
+    sites = load_sites()
+    if not sites:
+        save_sites(fetch_accessible_resources(get_token()))
+        sites = load_sites()
 
-    try:
-        if not paginate:
-            response = oauth.request(method, url, params=params, json=data)
-            response.raise_for_status()
-            return response.json()
+    if "all" in selectors:
+        return sites
 
-        # Pagination logic
-        all_issues = []
-        start_at = 0
-        max_results = 100
+    resolved = []
+    for selector in selectors:
+        selector = selector.rstrip("/")
+        match = next((
+            site for site in sites
+            if selector in (site["id"], site["name"], site["url"], (site["url"] or "").split("://")[-1])
+        ), None)
+        if not match:
+            raise Exception(f"Unknown or inaccessible Jira site: {selector}")
+        resolved.append(match)
+    return resolved
+
+# Page-by-page iterator so callers can stream large result sets
+def iter_pages(endpoint, method="GET", params=None, data=None, page_size=100, cloud_id=None):
+    token = get_token()
+    cloud_id = cloud_id or default_cloud_id(token)
 
-        while True:
-            paged_params = dict(params or {})
-            paged_params.update({
-                "startAt": start_at,
-                "maxResults": max_results
-            })
+    url = f"{API_BASE_URL}/ex/jira/{cloud_id}/rest/api/3/{endpoint}"
+    oauth = get_session(token)
+    start_at = 0
+
+    while True:
+        paged_params = dict(params or {})
+        paged_params.update({
+            "startAt": start_at,
+            "maxResults": page_size
+        })
 
+        response = oauth.request(method, url, params=paged_params, json=data)
+        if response.status_code == 401:
+            token = refresh_token_once(token)
+            oauth = get_session(token)
             response = oauth.request(method, url, params=paged_params, json=data)
-            response.raise_for_status()
-            result = response.json()
+        response.raise_for_status()
+        result = response.json()
 
-            issues = result.get("issues", [])
-            all_issues.extend(issues)
+        yield result
 
-            total = result.get("total", 0)
-            start_at += max_results
+        total = result.get("total", 0)
+        start_at += page_size
 
-            if start_at >= total:
-                break
+        if start_at >= total:
+            break
 
-        return {"issues": all_issues}
+# Main API request with refresh handling and optional pagination
+def api_request(endpoint, method="GET", params=None, data=None, paginate=False, cloud_id=None):
+    if paginate:
+        all_issues = []
+        warnings = []
+        for page in iter_pages(endpoint, method=method, params=params, data=data, cloud_id=cloud_id):
+            all_issues.extend(page.get("issues", []))
+            warnings.extend(page.get("warningMessages", []))
+        return {"issues": all_issues, "warningMessages": warnings}
+
+    token = get_token()
+    cloud_id = cloud_id or default_cloud_id(token)
+
+    url = f"{API_BASE_URL}/ex/jira/{cloud_id}/rest/api/3/{endpoint}"
+    oauth = get_session(token)
+
+    try:
+        response = oauth.request(method, url, params=params, json=data)
+        response.raise_for_status()
+        return response.json()
 
     except HTTPError as e:
         if e.response.status_code == 401:
-            token = refresh_token(token)
-            oauth = OAuth2Session(CLIENT_ID, token=token)
+            token = refresh_token_once(token)
+            oauth = get_session(token)
             response = oauth.request(method, url, params=params, json=data)
             response.raise_for_status()
             return response.json()
         else:
             raise
+
+# Run the same request against several sites concurrently. Failures are
+# collected per site instead of aborting the other sites.
+def api_request_sites(endpoint, sites, method="GET", params=None, data=None, paginate=False):
+    get_token()
+
+    def request_site(site):
+        return api_request(endpoint, method=method, params=params, data=data, paginate=paginate, cloud_id=site["id"])
+
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=min(SITE_WORKERS, len(sites)) or 1) as executor:
+        futures = {site["name"] or site["id"]: executor.submit(request_site, site) for site in sites}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+                print(f"Error querying site {name}: {e}")
+    return results, errors
@@ -8,6 +8,20 @@ START_DATE_FIELD = "customfield_13135"
 TARGET_END_FIELD = "customfield_13192"
 TEAM_FIELD = "customfield_11400"
 SPRINT_FIELD = "customfield_10002"
+EPIC_LINK_FIELD = "customfield_10014"
+BLOCKS_LINK_TYPE = "Blocks"
+
+def parse_blocking_links(issuelinks):
+    blocks = []
+    blocked_by = []
+    for link in issuelinks or []:
+        if link.get("type", {}).get("name") != BLOCKS_LINK_TYPE:
+            continue
+        if link.get("outwardIssue"):
+            blocks.append(link["outwardIssue"].get("key"))
+        if link.get("inwardIssue"):
+            blocked_by.append(link["inwardIssue"].get("key"))
+    return blocks, blocked_by
 
 def parse_issues_to_dataframe(jira_json):
     issues = jira_json.get("issues", [])
@@ -28,6 +42,14 @@ def parse_issues_to_dataframe(jira_json):
         issue_type_subtask = issuetype.get("subtask")
         issue_type_hierarchy = issuetype.get("hierarchyLevel")
 
+        # Parent / epic link extraction
+        parent = fields.get("parent") or {}
+        parent_key = parent.get("key")
+        epic_link = fields.get(EPIC_LINK_FIELD)
+
+        # "blocks" / "is blocked by" links
+        blocks, blocked_by = parse_blocking_links(fields.get("issuelinks"))
+
         parsed_issue = {
             "Key": issue.get("key"),
             "Summary": fields.get("summary"),
@@ -45,10 +67,26 @@ def parse_issues_to_dataframe(jira_json):
             "Sprint": sprint_name,
             "IssueType": issue_type_name,
             "IssueTypeSubtask": issue_type_subtask,
-            "IssueTypeHierarchy": issue_type_hierarchy
+            "IssueTypeHierarchy": issue_type_hierarchy,
+            "Parent": parent_key,
+            "EpicLink": epic_link,
+            "ParentKey": parent_key or epic_link,
+            "Blocks": blocks,
+            "BlockedBy": blocked_by
         }
 
         parsed.append(parsed_issue)
 
     df = pd.DataFrame(parsed)
     return df
+
+def parse_site_results_to_dataframe(site_results):
+    frames = []
+    for site, jira_json in site_results.items():
+        df = parse_issues_to_dataframe(jira_json)
+        df["Site"] = site
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,234 @@
+import math
+import time
+import threading
+import pandas as pd
+from functools import partial
+from bokeh.application import Application
+from bokeh.application.handlers.function import FunctionHandler
+from bokeh.models import ColumnDataSource, Div
+from bokeh.server.server import Server
+from jira_client import api_request
+from jira_parser import parse_issues_to_dataframe
+from hierarchy import KEY_BATCH_SIZE
+from chart_prep import LAYOUT_COLUMNS, assign_lanes, prepare_bars, prepare_gantt_layout
+from charts_bokeh import build_gantt_figure, gantt_source_data, lane_factors
+from snapshots import same_values
+
+DEFAULT_INTERVAL_SECONDS = 60
+DEFAULT_PORT = 5006
+POLL_OVERLAP_MINUTES = 1
+
+# One poller per sprint, shared by every browser session showing it. Jira is
+# queried on a background thread so the server's IO loop never blocks; each
+# session applies the result on its own document's next tick.
+class SprintPoller:
+    def __init__(self, sprint_name, interval_seconds=DEFAULT_INTERVAL_SECONDS):
+        self.sprint_name = sprint_name
+        self.interval_seconds = interval_seconds
+        self.jql = f'Sprint = "{sprint_name}"'
+        self.issues = None
+        self.last_poll = None
+        self.sessions = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def load(self):
+        self.last_poll = time.time()
+        result = api_request(endpoint="search", params={"jql": self.jql}, paginate=True)
+        self.issues = parse_issues_to_dataframe(result)
+
+    def subscribe(self, session):
+        with self.lock:
+            self.sessions.add(session)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self, session):
+        with self.lock:
+            self.sessions.discard(session)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval_seconds)
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error polling Jira: {e}")
+
+    def poll(self):
+        changed, removed = self.fetch_updates()
+        if changed.empty and not removed:
+            return
+
+        self.issues = self.merge_issues(changed, removed)
+        with self.lock:
+            sessions = list(self.sessions)
+        for session in sessions:
+            session.schedule(changed, removed, self.issues)
+
+    def fetch_updates(self):
+        # Relative JQL dates avoid server/client timezone mismatches
+        minutes = math.ceil((time.time() - self.last_poll) / 60) + POLL_OVERLAP_MINUTES
+        self.last_poll = time.time()
+        updated = f"updated >= -{minutes}m"
+
+        changed = parse_issues_to_dataframe(
+            api_request(endpoint="search", params={"jql": f"{self.jql} AND {updated}"}, paginate=True)
+        )
+
+        # A failed departure check must not throw away the changes already fetched
+        try:
+            removed = self.fetch_departures(updated)
+        except Exception as e:
+            print(f"Error checking for issues that left the sprint: {e}")
+            removed = set()
+        return changed, removed
+
+    def fetch_departures(self, updated):
+        # Moving an issue out of the sprint updates it, so only recently updated
+        # known issues need checking. validateQuery=warn keeps deleted or hidden
+        # keys from failing the whole query; those issues are then treated as gone.
+        removed = set()
+        keys = sorted(self.issues["Key"]) if "Key" in self.issues else []
+        for i in range(0, len(keys), KEY_BATCH_SIZE):
+            batch = keys[i:i + KEY_BATCH_SIZE]
+            jql = f'key in ({",".join(batch)}) AND {updated} AND (Sprint != "{self.sprint_name}" OR Sprint is EMPTY)'
+            params = {"jql": jql, "fields": "key", "validateQuery": "warn"}
+            result = api_request(endpoint="search", params=params, paginate=True)
+            removed |= {issue.get("key") for issue in result["issues"]}
+            warnings = " ".join(result["warningMessages"])
+            removed |= {key for key in batch if f"'{key}'" in warnings}
+        return removed
+
+    def merge_issues(self, changed, removed):
+        # Keep the raw issue frame current so a full rebuild is always possible
+        if "Key" not in self.issues:
+            return changed.reset_index(drop=True)
+        issues = self.issues[~self.issues["Key"].isin(removed)]
+        if not changed.empty:
+            issues = issues[~issues["Key"].isin(changed["Key"])]
+            issues = pd.concat([issues, changed], ignore_index=True)
+        return issues
+
+# One instance per browser session: the layout frame (row i is row i of the
+# ColumnDataSource) and the Bokeh models being patched.
+class LiveGantt:
+    def __init__(self, poller):
+        self.poller = poller
+        self.doc = None
+        self.layout = None
+        self.source = None
+        self.figure = None
+        self.placeholder = None
+
+    def attach(self, doc):
+        # Subscribe before reading the issues so no update can fall in between
+        self.doc = doc
+        self.poller.subscribe(self)
+        doc.on_session_destroyed(lambda context: self.poller.unsubscribe(self))
+        doc.title = f"Live Gantt: {self.poller.sprint_name}"
+
+        issues = self.poller.issues
+        layout = prepare_gantt_layout(issues) if not issues.empty else None
+        if layout is None:
+            # Keep the session open; the chart appears once dated issues arrive
+            print(f"No plottable issues found for sprint: {self.poller.sprint_name}, waiting for updates")
+            self.placeholder = Div(text=f"Waiting for issues with start and target dates in {self.poller.sprint_name}...")
+            doc.add_root(self.placeholder)
+            return
+        self.show(layout)
+
+    def show(self, layout):
+        self.layout = layout
+        self.source = ColumnDataSource(gantt_source_data(layout))
+        title = f"Live Gantt Chart for Sprint: {self.poller.sprint_name}"
+        self.figure = build_gantt_figure(layout, title, source=self.source)
+        if self.placeholder is not None:
+            self.doc.remove_root(self.placeholder)
+            self.placeholder = None
+        self.doc.add_root(self.figure)
+
+    def schedule(self, changed, removed, issues):
+        # Called from the poller thread; Bokeh models may only change on the IO loop
+        self.doc.add_next_tick_callback(partial(self.apply_changes, changed, removed, issues))
+
+    def apply_changes(self, changed, removed, issues):
+        if self.layout is None:
+            layout = prepare_gantt_layout(issues) if not issues.empty else None
+            if layout is not None:
+                self.show(layout)
+            return
+
+        bars = prepare_bars(changed) if not changed.empty else None
+        bars = bars.set_index("Key") if bars is not None else pd.DataFrame(columns=LAYOUT_COLUMNS).set_index("Key")
+
+        # Issues that left the sprint or lost their dates cannot be removed from a
+        # ColumnDataSource in place, so fall back to replacing its data
+        undated = set(changed["Key"]) - set(bars.index) if not changed.empty else set()
+        if (removed | undated) & set(self.layout["Key"]):
+            print(f"{len(removed | undated)} issues left the chart, rebuilding data")
+            self.replace_layout(prepare_gantt_layout(issues))
+            return
+
+        old = self.layout
+        new = old.set_index("Key")
+        existing = bars.index.intersection(new.index)
+        appended = bars.index.difference(new.index)
+
+        affected_teams = set(bars["Team"]) | set(new.loc[existing, "Team"])
+        bars["Lane"] = -1
+        columns = [c for c in LAYOUT_COLUMNS if c != "Key"]
+        new.loc[existing, columns] = bars.loc[existing, columns]
+        new = pd.concat([new, bars.loc[appended, columns]])
+
+        # Only the affected teams get their swimlanes recomputed
+        team_rows = new[new["Team"].isin(affected_teams)].reset_index()
+        relaned = assign_lanes(team_rows).set_index("Key")
+        new.loc[relaned.index, "Lane"] = relaned["Lane"]
+        new = new.reset_index()[LAYOUT_COLUMNS].astype(old.dtypes.to_dict())
+
+        head = new.iloc[:len(old)]
+        dirty = ~pd.concat([same_values(head[c], old[c]) for c in LAYOUT_COLUMNS], axis=1).all(axis=1)
+        dirty_rows = list(dirty[dirty].index)
+
+        if dirty_rows:
+            data = gantt_source_data(new.iloc[dirty_rows])
+            patches = {
+                column: [(row, values[i]) for i, row in enumerate(dirty_rows)]
+                for column, values in data.items() if column != "index"
+            }
+            self.source.patch(patches)
+
+        if len(appended):
+            self.source.stream(gantt_source_data(new.iloc[len(old):]))
+
+        self.layout = new
+        self.update_lanes()
+        print(f"Applied {len(dirty_rows)} patched and {len(appended)} new issues")
+
+    def replace_layout(self, layout):
+        if layout is None:
+            return
+        self.layout = layout
+        self.source.data = gantt_source_data(layout)
+        self.update_lanes()
+
+    def update_lanes(self):
+        factors = list(reversed(lane_factors(self.layout)))
+        if [tuple(f) for f in self.figure.y_range.factors] != factors:
+            self.figure.y_range.factors = factors
+            self.figure.height = 300 + 55 * len(factors)
+
+def run_live_gantt(sprint_name, interval_seconds=DEFAULT_INTERVAL_SECONDS, port=DEFAULT_PORT):
+    poller = SprintPoller(sprint_name, interval_seconds=interval_seconds)
+    poller.load()
+
+    def make_document(doc):
+        LiveGantt(poller).attach(doc)
+
+    server = Server({"/": Application(FunctionHandler(make_document))}, port=port)
+    server.start()
+    print(f"Serving live Gantt chart on http://localhost:{port}/ (polling every {interval_seconds}s)")
+    server.io_loop.add_callback(server.show, "/")
+    server.io_loop.start()
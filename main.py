@@ -2,9 +2,14 @@ import argparse
 import json
 from config import load_config, update_config, save_config
 from dotenv import load_dotenv
-from jira_client import api_request
-from jira_parser import parse_issues_to_dataframe
-from charts_bokeh import gantt_chart_for_sprint_bokeh
+from jira_client import api_request, api_request_sites, resolve_sites
+from jira_parser import parse_issues_to_dataframe, parse_site_results_to_dataframe
+from charts_bokeh import rolling_percentile_chart_bokeh
+from chart_prep import RENDERERS, load_sprint_issues, load_issue_children, run_gantt
+from live_gantt import run_live_gantt
+from snapshots import TRACKED_COLUMNS, save_snapshot, list_snapshots, load_snapshot, diff_snapshots, summarize_diff, diff_to_dataframe
+from cycle_time import collect_sketches, load_sketches, merge_sketches, save_sketches, summary_table, rolling_percentiles
+from hierarchy import HIERARCHY_LEVELS
 
 DEFAULT_CONFIG = {
     "jira_url": "",
@@ -50,21 +55,67 @@ def query(args):
             print("You must supply either --jql or --sprint-name")
             return
 
-        result = api_request(
-            endpoint="search",
-            params={"jql": jql},
-            paginate=True
-        )
-        df = parse_issues_to_dataframe(result)
+        if args.site:
+            sites = resolve_sites(args.site)
+            print(f"Querying {len(sites)} site(s): {', '.join(site['name'] or site['id'] for site in sites)}")
+            results, errors = api_request_sites(
+                endpoint="search",
+                sites=sites,
+                params={"jql": jql},
+                paginate=True
+            )
+            df = parse_site_results_to_dataframe(results)
+            if errors:
+                print(f"{len(errors)} site(s) failed: {', '.join(errors)}")
+        else:
+            result = api_request(
+                endpoint="search",
+                params={"jql": jql},
+                paginate=True
+            )
+            df = parse_issues_to_dataframe(result)
         print(df)
 
         if args.export:
             df.to_csv(args.export, index=False)
             print(f"Exported results to {args.export}")
 
+        if args.snapshot and not df.empty:
+            path = save_snapshot(df, args.snapshot)
+            print(f"Saved snapshot to {path}")
+
     except Exception as e:
         print(f"Error running query: {e}")
 
+def diff(args):
+    try:
+        if args.list:
+            stamps = list_snapshots(args.snapshot)
+            print(f"{len(stamps)} snapshot(s) stored for {args.snapshot}:")
+            for stamp in stamps:
+                print(f"  {stamp}")
+            return
+
+        before_stamp, before = load_snapshot(args.snapshot, args.from_ref, columns=TRACKED_COLUMNS)
+        after_stamp, after = load_snapshot(args.snapshot, args.to_ref, columns=TRACKED_COLUMNS)
+        print(f"Comparing {args.snapshot}: {before_stamp} -> {after_stamp}")
+
+        changes = diff_snapshots(before, after)
+        for key, value in summarize_diff(changes, before, after).items():
+            print(f"  {key}: {value:g}")
+
+        for change_type, frame in changes.items():
+            if not frame.empty:
+                print(f"\n{change_type.capitalize()} issues:")
+                print(frame)
+
+        if args.export:
+            diff_to_dataframe(changes).to_csv(args.export, index=False)
+            print(f"Exported diff to {args.export}")
+
+    except Exception as e:
+        print(f"Error diffing snapshots: {e}")
+
 def discover_fields(args):
     print(f"Discovering fields with JQL: {args.jql}")
     try:
@@ -87,7 +138,63 @@ def discover_fields(args):
         print(f"Error discovering fields: {e}")
 
 def run_chart(args):
-    gantt_chart_for_sprint_bokeh(args.sprint_name, export_path=args.export)
+    if args.live:
+        if not args.sprint_name:
+            print("Live mode requires --sprint-name")
+            return
+        run_live_gantt(args.sprint_name, interval_seconds=args.interval, port=args.port)
+        return
+
+    if args.drill_down:
+        site = args.site[0] if args.site else None
+        df, title = load_issue_children(args.drill_down, level=args.level, site=site)
+    elif args.sprint_name:
+        df, title = load_sprint_issues(args.sprint_name, level=args.level, sites=args.site)
+    else:
+        print("You must supply either --sprint-name or --drill-down")
+        return
+
+    run_gantt(df, title, renderers=args.renderer, export_path=args.export, dependencies=args.dependencies,
+              image_path=args.image_path)
+
+def cycle_time(args):
+    try:
+        sketches = load_sketches(args.merge) if args.merge else {}
+
+        if args.sprint_name:
+            jql = f'Sprint = "{args.sprint_name}"'
+        else:
+            jql = args.jql
+
+        if jql:
+            print(f"Collecting cycle/lead times with JQL: {jql}")
+            merge_sketches(sketches, collect_sketches(jql))
+        elif not args.merge:
+            print("You must supply --jql, --sprint-name or --merge")
+            return
+
+        if not sketches:
+            print("No resolved issues found.")
+            return
+
+        if args.sketch_out:
+            save_sketches(args.sketch_out, sketches)
+            print(f"Saved sketches to {args.sketch_out}")
+
+        summary = summary_table(sketches)
+        print(summary.to_string(index=False))
+
+        if args.export:
+            summary.to_csv(args.export, index=False)
+            print(f"Exported summary to {args.export}")
+
+        if not args.no_chart:
+            rolling = rolling_percentiles(sketches, window_weeks=args.window, team=args.team)
+            title = f"Rolling {args.window}-week percentiles" + (f" for {args.team}" if args.team else "")
+            rolling_percentile_chart_bokeh(rolling, title)
+
+    except Exception as e:
+        print(f"Error running cycle-time analytics: {e}")
 
 def main():
     load_dotenv()
@@ -115,8 +222,19 @@ def main():
     query_parser.add_argument('--jql', help='Run raw JQL query')
     query_parser.add_argument('--sprint-name', help='Sprint name to query using JQL')
     query_parser.add_argument('--export', help='Export results to CSV file')
+    query_parser.add_argument('--site', nargs='+', help='Jira site ids, names or URLs to query, or "all"')
+    query_parser.add_argument('--snapshot', help='Store the results as a snapshot under this name')
     query_parser.set_defaults(func=query)
 
+    # diff command
+    diff_parser = subparsers.add_parser('diff', help='Compare two stored snapshots')
+    diff_parser.add_argument('--snapshot', required=True, help='Snapshot name used with query --snapshot')
+    diff_parser.add_argument('--from', dest='from_ref', default='-2', help='Earlier snapshot: timestamp prefix, position or "latest" (default: -2)')
+    diff_parser.add_argument('--to', dest='to_ref', default='latest', help='Later snapshot: timestamp prefix, position or "latest" (default: latest)')
+    diff_parser.add_argument('--export', help='Export added, removed and changed issues to CSV')
+    diff_parser.add_argument('--list', action='store_true', help='List stored snapshots instead of diffing')
+    diff_parser.set_defaults(func=diff)
+
     # discover-fields command
     discover_parser = subparsers.add_parser('discover-fields', help='Discover field keys from Jira')
     discover_parser.add_argument('--jql', required=True)
@@ -124,10 +242,32 @@ def main():
 
     # chart command
     chart_parser = subparsers.add_parser('chart', help='Generate Gantt chart for a sprint')
-    chart_parser.add_argument('--sprint-name', required=True, help='Sprint name for Gantt chart')
+    chart_parser.add_argument('--sprint-name', help='Sprint name for Gantt chart')
     chart_parser.add_argument('--export', help='Optional path to export chart data to CSV')
+    chart_parser.add_argument('--level', choices=list(HIERARCHY_LEVELS), help='Roll issues up to this hierarchy level')
+    chart_parser.add_argument('--drill-down', help='Issue key to drill into (loads its child issues)')
+    chart_parser.add_argument('--site', nargs='+', help='Jira site ids, names or URLs to chart, or "all"')
+    chart_parser.add_argument('--renderer', nargs='+', choices=list(RENDERERS), default=['bokeh'],
+                              help='One or more chart backends to render (default: bokeh)')
+    chart_parser.add_argument('--image-path', help='Output path for the image renderer (default: gantt.png)')
+    chart_parser.add_argument('--dependencies', action='store_true', help='Overlay "blocks" links and highlight the critical path')
+    chart_parser.add_argument('--live', action='store_true', help='Serve a live-updating sprint chart with a Bokeh server')
+    chart_parser.add_argument('--interval', type=int, default=60, help='Live mode polling interval in seconds (default: 60)')
+    chart_parser.add_argument('--port', type=int, default=5006, help='Live mode server port (default: 5006)')
     chart_parser.set_defaults(func=run_chart)
 
+    # cycle-time command
+    cycle_parser = subparsers.add_parser('cycle-time', help='Cycle and lead time percentiles')
+    cycle_parser.add_argument('--jql', help='JQL selecting the issues to analyse')
+    cycle_parser.add_argument('--sprint-name', help='Sprint name to analyse')
+    cycle_parser.add_argument('--merge', nargs='+', help='Sketch files from earlier runs or other shards to combine')
+    cycle_parser.add_argument('--sketch-out', help='Save the merged sketches to this file')
+    cycle_parser.add_argument('--export', help='Export the percentile summary table to CSV')
+    cycle_parser.add_argument('--window', type=int, default=4, help='Rolling window size in weeks (default: 4)')
+    cycle_parser.add_argument('--team', help='Restrict the rolling chart to one team')
+    cycle_parser.add_argument('--no-chart', action='store_true', help='Skip the rolling percentile chart')
+    cycle_parser.set_defaults(func=cycle_time)
+
     args = parser.parse_args()
     if hasattr(args, 'func'):
         args.func(args)
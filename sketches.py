@@ -0,0 +1,82 @@
+import math
+import numpy as np
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Mergeable quantile sketch with logarithmic buckets (DDSketch style).
+# Quantiles stay within the relative accuracy of the true value, and sketches
+# with the same accuracy merge exactly, so pages and shards combine later.
+class DurationSketch:
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, values):
+        # Negative durations are bad data, not zero; leave them out of count and total alike
+        values = np.asarray(values, dtype=float)
+        values = values[values >= 0]
+        if values.size == 0:
+            return
+
+        positive = values[values > 0]
+        self.zero_count += int(values.size - positive.size)
+        self.count += int(values.size)
+        self.total += float(positive.sum())
+
+        indexes = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+        bucket_ids, counts = np.unique(indexes, return_counts=True)
+        for bucket_id, count in zip(bucket_ids.tolist(), counts.tolist()):
+            self.buckets[bucket_id] = self.buckets.get(bucket_id, 0) + count
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy.")
+        for bucket_id, count in other.buckets.items():
+            self.buckets[bucket_id] = self.buckets.get(bucket_id, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for bucket_id in sorted(self.buckets):
+            seen += self.buckets[bucket_id]
+            if seen > rank:
+                return 2 * self.gamma ** bucket_id / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def mean(self):
+        if self.count == 0:
+            return float("nan")
+        return self.total / self.count
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"])
+        sketch.buckets = {int(k): v for k, v in data["buckets"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        return sketch
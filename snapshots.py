@@ -0,0 +1,144 @@
+import os
+import re
+import datetime
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_SUFFIX = ".parquet"
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S"
+
+# Columns compared between snapshots; StoryPoints deltas are reported separately
+TRACKED_COLUMNS = [
+    "Summary", "Status", "StatusCategory", "StoryPoints", "Assignee",
+    "Team", "Sprint", "StartDate", "TargetEnd", "Resolved"
+]
+
+# Low-cardinality text columns are stored as dictionary-encoded categoricals
+CATEGORY_COLUMNS = [
+    "Status", "StatusCategory", "Assignee", "TempDev", "QATester", "Team",
+    "Sprint", "IssueType", "Site"
+]
+
+def snapshot_dir(name):
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_")
+    return os.path.join(SNAPSHOT_DIR, slug)
+
+# Keys are only unique within a site, so multi-site results are indexed on both
+def snapshot_index(df):
+    return ["Site", "Key"] if "Site" in df else ["Key"]
+
+def save_snapshot(df, name, timestamp=None):
+    timestamp = timestamp or datetime.datetime.now()
+    directory = snapshot_dir(name)
+    os.makedirs(directory, exist_ok=True)
+
+    index = snapshot_index(df)
+    df = df.drop_duplicates(subset=index).set_index(index).sort_index()
+    df["StoryPoints"] = pd.to_numeric(df["StoryPoints"], errors="coerce")
+    for column in CATEGORY_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("category")
+
+    path = os.path.join(directory, timestamp.strftime(TIMESTAMP_FORMAT) + SNAPSHOT_SUFFIX)
+    df.to_parquet(path, compression="zstd")
+    return path
+
+def list_snapshots(name):
+    directory = snapshot_dir(name)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(f[:-len(SNAPSHOT_SUFFIX)] for f in os.listdir(directory) if f.endswith(SNAPSHOT_SUFFIX))
+
+# A reference is "latest", a signed or one/two-digit position (-2 = one before
+# latest) or a timestamp prefix such as 202506, 20250601 or 20250601T0930
+def resolve_snapshot(name, ref):
+    stamps = list_snapshots(name)
+    if not stamps:
+        raise Exception(f"No snapshots stored for {name}.")
+
+    if ref in (None, "latest"):
+        return stamps[-1]
+    if re.fullmatch(r"[-+]\d+|\d{1,2}", ref):
+        position = int(ref)
+        if not -len(stamps) <= position < len(stamps):
+            hint = " (need at least two snapshots to diff)" if len(stamps) < 2 else ""
+            raise Exception(f"Snapshot position {ref} is out of range: {name} has {len(stamps)} snapshot(s){hint}.")
+        return stamps[position]
+
+    matches = [s for s in stamps if s.startswith(ref)]
+    if not matches:
+        raise Exception(f"No snapshot of {name} matches {ref}.")
+    return matches[-1]
+
+def load_snapshot(name, ref, columns=None):
+    stamp = resolve_snapshot(name, ref)
+    path = os.path.join(snapshot_dir(name), stamp + SNAPSHOT_SUFFIX)
+    return stamp, pd.read_parquet(path, columns=columns)
+
+def same_values(a, b):
+    return (a == b) | (a.isna() & b.isna())
+
+def diff_snapshots(before, after, columns=TRACKED_COLUMNS):
+    if before.index.names != after.index.names:
+        raise Exception("Snapshots are keyed differently (single-site vs multi-site) and cannot be compared.")
+
+    columns = [c for c in columns if c in before.columns and c in after.columns]
+    before = before[columns]
+    after = after[columns]
+
+    # Categoricals from different snapshots have different categories; compare as values
+    before = before.astype({c: "object" for c in columns if isinstance(before[c].dtype, pd.CategoricalDtype)})
+    after = after.astype({c: "object" for c in columns if isinstance(after[c].dtype, pd.CategoricalDtype)})
+
+    # Outer hash join on the (Site, )Key index
+    joined = before.join(after, how="outer", lsuffix="_before", rsuffix="_after")
+    in_before = joined.index.isin(before.index)
+    in_after = joined.index.isin(after.index)
+
+    added = after.loc[joined.index[in_after & ~in_before]]
+    removed = before.loc[joined.index[in_before & ~in_after]]
+
+    both = joined[in_before & in_after]
+    unchanged = pd.concat(
+        [same_values(both[f"{c}_before"], both[f"{c}_after"]).rename(c) for c in columns],
+        axis=1
+    )
+    dirty = ~unchanged.all(axis=1)
+    changed = both[dirty].copy()
+    names = np.array(columns)
+    changed["ChangedFields"] = [", ".join(names[row]) for row in ~unchanged[dirty].to_numpy()]
+    changed["StoryPointDelta"] = changed["StoryPoints_after"].fillna(0) - changed["StoryPoints_before"].fillna(0)
+
+    return {"added": added, "removed": removed, "changed": changed}
+
+def summarize_diff(diff, before, after):
+    points_before = pd.to_numeric(before["StoryPoints"], errors="coerce").sum()
+    points_after = pd.to_numeric(after["StoryPoints"], errors="coerce").sum()
+    changed = diff["changed"]
+    reestimated = changed[changed["StoryPointDelta"] != 0]
+
+    return {
+        "IssuesBefore": len(before),
+        "IssuesAfter": len(after),
+        "Added": len(diff["added"]),
+        "Removed": len(diff["removed"]),
+        "Changed": len(changed),
+        "Reestimated": len(reestimated),
+        "PointsBefore": points_before,
+        "PointsAfter": points_after,
+        "PointsAdded": diff["added"]["StoryPoints"].sum(),
+        "PointsRemoved": diff["removed"]["StoryPoints"].sum(),
+        "PointsReestimated": reestimated["StoryPointDelta"].sum()
+    }
+
+def diff_to_dataframe(diff):
+    frames = []
+    for change_type, frame in diff.items():
+        frame = frame.copy()
+        frame.insert(0, "ChangeType", change_type)
+        frames.append(frame)
+    result = pd.concat(frames)
+    if result.index.nlevels == 1:
+        result.index.name = "Key"
+    return result.reset_index()
@@ -1,8 +1,17 @@
 import os
+import re
+import json
+import hashlib
 import zipfile
 import pathspec
 import argparse
 import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_MANIFEST = ".zip_manifest.json"
+READ_CHUNK_BYTES = 1024 * 1024
+MAX_PENDING_PER_WORKER = 4
 
 def load_gitignore(gitignore_path):
     if not os.path.exists(gitignore_path):
@@ -14,32 +23,173 @@ def load_gitignore(gitignore_path):
     print(f"Loaded .gitignore with {len(lines)} patterns.")
     return spec
 
-def zip_project(source_dir, output_filename, gitignore_path=".gitignore"):
+def compile_ignore(spec):
+    patterns = [p for p in spec.patterns if p.include is not None]
+
+    # Negated patterns depend on ordering, so fall back to pathspec's own matcher
+    if any(not p.include for p in patterns):
+        return spec.match_file
+    if not patterns:
+        return lambda path: False
+
+    # Fold every pattern into one regex; group names must be unique per alternative
+    alternatives = []
+    for i, p in enumerate(patterns):
+        alternatives.append(re.sub(r"\(\?P<(\w+)>", rf"(?P<\1_{i}>", p.regex.pattern))
+    combined = re.compile("|".join(f"(?:{a})" for a in alternatives))
+    return lambda path: combined.match(path) is not None
+
+def scan_tree(source_dir, is_ignored, excluded=()):
+    # Yields (rel_path, full_path, size, mtime_ns, ignored), pruning ignored directories early
+    stack = [("", source_dir)]
+    while stack:
+        rel_root, root = stack.pop()
+        with os.scandir(root) as entries:
+            for entry in entries:
+                rel_path = f"{rel_root}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_ignored(rel_path + "/"):
+                        stack.append((rel_path + "/", entry.path))
+                elif entry.is_file():
+                    if rel_path in excluded:
+                        continue
+                    st = entry.stat()
+                    yield rel_path, entry.path, st.st_size, st.st_mtime_ns, is_ignored(rel_path)
+
+def load_manifest(manifest_path):
+    if not manifest_path or not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        print(f"Warning: manifest {manifest_path} was invalid, archiving all files.")
+        return {}
+
+def save_manifest(manifest_path, manifest):
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+def hash_file(full_path):
+    # Runs in a worker process: the hash decides whether a touched file really changed
+    digest = hashlib.sha256()
+    with open(full_path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_files(tasks, workers=None):
+    # Yields (task, content_hash) in order while keeping only a bounded window of
+    # futures in flight, so the main process can write entries as hashes arrive
+    limit = (workers or os.cpu_count() or 1) * MAX_PENDING_PER_WORKER
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for task in tasks:
+            if len(pending) >= limit:
+                done_task, future = pending.popleft()
+                yield done_task, future.result()
+            pending.append((task, executor.submit(hash_file, task[1])))
+        while pending:
+            done_task, future = pending.popleft()
+            yield done_task, future.result()
+
+def shard_paths(output_filename, shards):
+    root, ext = os.path.splitext(output_filename)
+    return [f"{root}.part{i + 1}{ext or '.zip'}" for i in range(shards)]
+
+def plan_shards(entries, shards):
+    # Largest files first onto the lightest shard keeps the workers evenly loaded
+    plans = [[] for _ in range(shards)]
+    loads = [0] * shards
+    for entry in sorted(entries, key=lambda e: e[2], reverse=True):
+        lightest = loads.index(min(loads))
+        plans[lightest].append(entry)
+        loads[lightest] += entry[2]
+    return plans
+
+def write_archive(output_filename, entries, extra_files=None):
+    # Runs in a worker process for sharded archives; streams each file through zipfile
+    with zipfile.ZipFile(output_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for rel_file, full_path, _ in entries:
+            zipf.write(full_path, rel_file)
+        for name, text in (extra_files or {}).items():
+            zipf.writestr(name, text)
+    return len(entries)
+
+def zip_project(source_dir, output_filename, gitignore_path=".gitignore", incremental=False,
+                manifest_path=None, workers=None, verbose=False):
     spec = load_gitignore(os.path.join(source_dir, gitignore_path))
+    is_ignored = compile_ignore(spec)
+
+    manifest_path = manifest_path or os.path.join(source_dir, DEFAULT_MANIFEST)
+    previous = load_manifest(manifest_path) if incremental else {}
+
+    # More than one worker compresses in parallel, each into its own part archive
+    outputs = shard_paths(output_filename, workers) if workers and workers > 1 else [output_filename]
+
+    # Never archive our own output or bookkeeping
+    excluded = set()
+    for path in outputs + [manifest_path]:
+        rel = os.path.relpath(os.path.abspath(path), source_dir)
+        if not rel.startswith(".."):
+            excluded.add(rel.replace(os.sep, "/"))
 
     total_files = 0
-    added_files = 0
+    skipped_files = 0
+    manifest = {}
+    tasks = []
 
-    with zipfile.ZipFile(output_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(source_dir):
-            rel_root = os.path.relpath(root, source_dir)
-            if rel_root == '.':
-                rel_root = ''
-            # Filter out ignored directories
-            dirs[:] = [d for d in dirs if not spec.match_file(os.path.join(rel_root, d))]
-
-            for file in files:
-                total_files += 1
-                rel_file = os.path.join(rel_root, file)
-                full_path = os.path.join(root, file)
-                if not spec.match_file(rel_file):
-                    zipf.write(full_path, rel_file)
-                    added_files += 1
-                    print(f"Adding:   {rel_file}")
-                else:
-                    print(f"Skipping: {rel_file}")
-
-    print(f"\n✅ Done! {added_files} files added to {output_filename}. {total_files - added_files} files excluded.")
+    for rel_file, full_path, size, mtime_ns, ignored in scan_tree(source_dir, is_ignored, excluded):
+        total_files += 1
+        if ignored:
+            if verbose:
+                print(f"Skipping: {rel_file}")
+            continue
+
+        old = previous.get(rel_file)
+        if old and old[0] == size and old[1] == mtime_ns:
+            manifest[rel_file] = old
+            skipped_files += 1
+            continue
+
+        # Same size but touched: compare content hashes before archiving again
+        previous_hash = old[2] if old and old[0] == size else None
+        tasks.append((rel_file, full_path, size, mtime_ns, previous_hash))
+
+    # Full archives need no hashes; incremental runs hash in worker processes first
+    entries = []
+    results = hash_files(tasks, workers) if incremental else ((task, None) for task in tasks)
+    for (rel_file, full_path, size, mtime_ns, previous_hash), content_hash in results:
+        if incremental:
+            manifest[rel_file] = [size, mtime_ns, content_hash]
+            if content_hash == previous_hash:
+                skipped_files += 1
+                continue
+        entries.append((rel_file, full_path, size))
+        if verbose:
+            print(f"Adding:   {rel_file}")
+
+    removed = sorted(set(previous) - set(manifest))
+    extra_files = {".removed_files": "\n".join(removed) + "\n"} if removed else {}
+
+    if len(outputs) == 1:
+        added_files = write_archive(output_filename, entries, extra_files)
+    else:
+        plans = plan_shards(entries, len(outputs))
+        with ProcessPoolExecutor(max_workers=len(outputs)) as executor:
+            futures = [
+                executor.submit(write_archive, path, plan, extra_files if i == 0 else None)
+                for i, (path, plan) in enumerate(zip(outputs, plans))
+            ]
+            added_files = sum(future.result() for future in futures)
+
+    if incremental:
+        save_manifest(manifest_path, manifest)
+
+    excluded_files = total_files - added_files - skipped_files
+    print(f"\n✅ Done! {added_files} files added to {', '.join(outputs)}. {excluded_files} files excluded.")
+    if incremental:
+        print(f"   {skipped_files} unchanged files skipped, {len(removed)} removed since last run.")
 
 def get_default_output_filename():
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -49,6 +199,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Zip project while respecting .gitignore")
     parser.add_argument("--dir", default=".", help="Project directory to zip (default: current directory)")
     parser.add_argument("--output", help="Output zip file name (default: timestamped filename)")
+    parser.add_argument("--incremental", action="store_true", help="Only archive files changed since the last incremental run")
+    parser.add_argument("--manifest", help=f"Manifest used for incremental runs (default: {DEFAULT_MANIFEST} in --dir)")
+    parser.add_argument("--workers", type=int, help="Compress in this many worker processes, writing one part archive each (default: a single archive)")
+    parser.add_argument("--verbose", action="store_true", help="Print every added and skipped file")
     args = parser.parse_args()
 
     project_dir = os.path.abspath(args.dir)
@@ -57,4 +211,5 @@ if __name__ == "__main__":
     print(f"📦 Zipping project: {project_dir}")
     print(f"📄 Output file: {output_file}\n")
 
-    zip_project(project_dir, output_file)
+    zip_project(project_dir, output_file, incremental=args.incremental, manifest_path=args.manifest,
+                workers=args.workers, verbose=args.verbose)